@@ -0,0 +1,81 @@
+from math import pi, cos, sin, sqrt
+import numpy as np
+from numba import cuda
+from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_uniform_float64
+
+_available = None # cached result of the device probe
+_rng_states = None # per-thread xoroshiro128p states, grown on demand
+
+
+def is_available():
+    """ Indicates if a CUDA device can be used, probing the driver only once.
+
+        Returns:
+            bool: True if a CUDA device is available, false otherwise.
+    """
+    global _available
+    if _available is None:
+        try:
+            _available = cuda.is_available()
+        except Exception:
+            _available = False
+    return _available
+
+
+@cuda.jit
+def _spotlight_kernel(primary_angle, base_energy, radians_range, energy_loss_per_radian, rng_states, angles, cosines, sines, energies):
+    """ One CUDA thread per spotlight ray candidate: draws the triangular
+        deviation, applies the energy cutoff and writes angle, direction
+        components and energy to its own slot (dead rays get zero energy).
+    """
+    i = cuda.grid(1)
+    if i >= angles.size:
+        return
+    deviation = radians_range * (1.0 - sqrt(xoroshiro128p_uniform_float64(rng_states, i)))
+    side = 1.0 if xoroshiro128p_uniform_float64(rng_states, i) < 0.5 else -1.0
+    angle = (primary_angle + side * deviation) % (2 * pi)
+
+    energy = base_energy - deviation * energy_loss_per_radian
+    if energy > 0:
+        angles[i] = angle
+        cosines[i] = cos(angle)
+        sines[i] = sin(angle)
+        energies[i] = energy
+    else:
+        energies[i] = 0.0
+
+
+def spotlight_batch(primary_angle, base_energy, rays_number, radians_range, energy_loss_per_radian):
+    """ CUDA counterpart of _jit_math.spotlight_batch, with the same signature
+        and return layout so the two backends are interchangeable. Each ray
+        candidate is handled by one CUDA thread; survivors are compacted on the
+        host after the kernel returns.
+
+        Args:
+            primary_angle (float): Angle of the primary ray in radians.
+            base_energy (float): Energy passed down to the spotlight rays.
+            rays_number (int): Number of candidate rays to generate.
+            radians_range (float): Spotlight deviation range in radians.
+            energy_loss_per_radian (float): Amount of energy lost by radian deviation.
+
+        Returns:
+            :obj:`tuple`: (angles, cosines, sines, energies, count) arrays with
+            the surviving rays packed in the first count slots.
+    """
+    global _rng_states
+    threads_per_block = 128
+    blocks = (rays_number + threads_per_block - 1) // threads_per_block
+    if _rng_states is None or len(_rng_states) < blocks * threads_per_block:
+        _rng_states = create_xoroshiro128p_states(blocks * threads_per_block, seed=np.random.randint(2 ** 31))
+
+    angles = cuda.device_array(rays_number)
+    cosines = cuda.device_array(rays_number)
+    sines = cuda.device_array(rays_number)
+    energies = cuda.device_array(rays_number)
+    _spotlight_kernel[blocks, threads_per_block](primary_angle, base_energy, radians_range, energy_loss_per_radian,
+                                                 _rng_states, angles, cosines, sines, energies)
+
+    energies = energies.copy_to_host()
+    alive = energies > 0
+    return (angles.copy_to_host()[alive], cosines.copy_to_host()[alive], sines.copy_to_host()[alive],
+            energies[alive], int(np.count_nonzero(alive)))
@@ -1,5 +1,8 @@
-from math import radians, degrees
+from math import radians, degrees, pi
 import random
+import numpy as np
+
+rng = np.random.default_rng() # shared generator, so batched draws reuse one RNG state
 
 
 class AngleRange:
@@ -44,5 +47,21 @@ class AngleRange:
             return radians(random.randint(min_degrees, max_degrees))
 
 
+    def sample(self, number_of_angles):
+        """ Returns a batch of random angles within the range, drawn in a single
+            call on the shared NumPy generator instead of one scalar draw per angle.
+
+            Args:
+                number_of_angles (int): Number of angles to draw.
+
+            Returns:
+                :obj:`ndarray` of float: Random angles in radians, in [0, 2π].
+        """
+        min_angle, max_angle = self.min, self.max
+        if min_angle > max_angle: # range goes from higher to lower angle
+            max_angle += 2 * pi
+        return rng.uniform(min_angle, max_angle, number_of_angles) % (2 * pi)
+
+
     def __str__(self):
         return '[{}°, {}°]'.format(int(degrees(self.min)), int(degrees(self.max)))
@@ -61,6 +61,9 @@ class LineSegment:
 
     def get_reflected_vector(self, reflection_point, vector):
         """ Returns the reflected vector upon hitting the line segment at a given point.
+            The reflected direction components are the incoming ones with one axis
+            mirrored, so they are reused from the incoming vector instead of
+            recomputing cos/sin for the reflection angle.
 
             Args:
                 reflection_point (:obj:`Point`): Point of reflection on the line.
@@ -69,16 +72,17 @@ class LineSegment:
             Returns:
                 :obj:`UnitVector`: Reflected vector.
         """
+        direction = vector.direction_vector
         if self.is_vertical():
             vector_comes_from_below = (reflection_point.y > vector.origin_point.y)
-            if vector_comes_from_below or vector.angle == 0 or vector.angle == radians(180):
-                reflection_angle = radians(180) - vector.angle
+            if vector_comes_from_below or vector.angle == 0 or vector.angle == pi:
+                reflection_angle = pi - vector.angle
             else:
-                reflection_angle = radians(540) - vector.angle
+                reflection_angle = 3 * pi - vector.angle
+            return UnitVector.from_components(reflection_point, -direction.x, direction.y, reflection_angle)
         else:
-            reflection_angle = radians(360) - vector.angle
-        reflected_vector = UnitVector(reflection_point, reflection_angle)
-        return reflected_vector
+            reflection_angle = 2 * pi - vector.angle
+            return UnitVector.from_components(reflection_point, direction.x, -direction.y, reflection_angle)
 
 
     def get_reflection_angle_range(self, reflection_point, vector):
@@ -1,5 +1,5 @@
 import pygame
-from math import radians, degrees
+from math import pi
 from point import Point
 from sonar import Sonar
 from line_segment import LineSegment
@@ -7,8 +7,12 @@ from unit_vector import UnitVector
 from ray_generator import RayGenerator
 from ray import Ray
 from echo_pixel import EchoPixel
+from concurrent.futures import ThreadPoolExecutor
 import threading
 
+_RAD2DEG = 180.0 / pi # inline multiplies instead of degrees()/radians() calls in hot paths
+_DEG2RAD = pi / 180.0
+
 
 def generate_echo_pixels(source_ray, sonar, line_obstacles, echo_pixels):
     """Recursive function that generates the echo pixels for a shot source ray.
@@ -26,7 +30,7 @@ def generate_echo_pixels(source_ray, sonar, line_obstacles, echo_pixels):
         source_ray.traveled_distance += sonar.center_point.get_distance_to(source_ray.vector.origin_point) # update traveled distance for collision
         pixel_energy = RayGenerator.get_energy_with_distance_loss(source_ray.energy, source_ray.traveled_distance)
         if pixel_energy > 0:
-            pixel_x, pixel_y = sonar.get_coordinates_around_center(radians(source_ray.angle_from_sonar), int(source_ray.traveled_distance/2))
+            pixel_x, pixel_y = sonar.get_coordinates_around_center(source_ray.angle_from_sonar * _DEG2RAD, int(source_ray.traveled_distance/2))
             generated_echo_pixel = EchoPixel(pixel_energy, Point(pixel_x, pixel_y))
             echo_pixels.append(generated_echo_pixel) # add pixel to drawing list
         return
@@ -34,9 +38,8 @@ def generate_echo_pixels(source_ray, sonar, line_obstacles, echo_pixels):
     hit_line = LineSegment.get_nearest_intersected_line(source_ray.vector, line_obstacles)
     ray_bounced = (hit_line is not None)
     if ray_bounced:
-        reflected_ray = RayGenerator.get_reflected_ray(source_ray, hit_line)
+        reflected_ray, returning_ray = RayGenerator.get_reflected_and_returning_rays(source_ray, hit_line)
         if reflected_ray.energy > 0:
-            returning_ray = RayGenerator.get_returning_reflected_ray(reflected_ray, source_ray)
             generated_rays = [reflected_ray, returning_ray]
 
             reflection_angle_range = hit_line.get_reflection_angle_range(reflected_ray.vector.origin_point, source_ray.vector)
@@ -63,7 +66,7 @@ def shoot_sonar_rays(mouse_point, sonar, line_obstacles, echo_pixels):
             echo_pixels (:obj:`list` of :obj:`EchoPixel`): List of displayed echo pixels.
     """
     sonar_ray_vector = UnitVector(sonar.center_point, sonar.center_point.get_angle_to(mouse_point))
-    main_ray = Ray(degrees(sonar_ray_vector.angle), sonar_ray_vector)
+    main_ray = Ray(sonar_ray_vector.angle * _RAD2DEG, sonar_ray_vector)
 
     sonar_view_range = sonar.get_view_angle_range()
     initial_sonar_rays = RayGenerator.get_initial_sonar_rays(sonar.center_point, sonar_view_range)
@@ -74,14 +77,11 @@ def shoot_sonar_rays(mouse_point, sonar, line_obstacles, echo_pixels):
         spotlight_rays.extend(RayGenerator.get_spotlight_rays(ray))
     initial_sonar_rays.extend(spotlight_rays)#"""
 
-    angle_threads = []
-    for ray in initial_sonar_rays:
-        thread = threading.Thread(target=generate_echo_pixels, args=[ray, sonar, line_obstacles, echo_pixels])
-        angle_threads.append(thread)
-        thread.start()
-
-    for thread in angle_threads:
-        thread.join()
+    with ThreadPoolExecutor() as executor: # one pooled worker per ray instead of one thread each
+        futures = [executor.submit(generate_echo_pixels, ray, sonar, line_obstacles, echo_pixels)
+                   for ray in initial_sonar_rays]
+        for future in futures:
+            future.result()
 
 
 def redraw_window(window, sonar, line_obstacles, echo_pixels):
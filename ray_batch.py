@@ -0,0 +1,116 @@
+from math import pi
+import numpy as np
+from point import Point
+from ray import Ray
+from unit_vector import UnitVector
+
+ANGLE_UNIT = 2 * pi / 65536 # radians per angle quantization step
+ENERGY_UNIT = 0.01 # energy per quantization step
+
+
+class RayBatch:
+    """ Structure-of-arrays container for a batch of rays. Instead of a list of
+        Ray objects, the ray fields live in parallel NumPy arrays, so batched
+        code can run array math over a whole wavefront without per-ray
+        allocation or attribute lookups. Angles and energies are stored
+        quantized to int16 (steps of 2π/65536 rad and 0.01 energy), shrinking
+        the wavefront footprint; they are converted to floats only at the
+        batch boundaries through get_angles and get_energies.
+
+        Attributes:
+            angle_from_sonar (:obj:`ndarray`): Initial angles from sonar, in degrees.
+            origin_x (:obj:`ndarray`): X coordinates of the ray origin points.
+            origin_y (:obj:`ndarray`): Y coordinates of the ray origin points.
+            angle (:obj:`ndarray` of int16): Ray angles, in steps of 2π/65536 radians.
+            energy (:obj:`ndarray` of int16): Ray sound energies, in steps of 0.01.
+            traveled_distance (:obj:`ndarray`): Pixels traveled by each ray.
+            bounces (:obj:`ndarray`): Number of times each ray has bounced.
+    """
+    def __init__(self, angle_from_sonar, origin_x, origin_y, angle, energy, traveled_distance, bounces):
+        self.angle_from_sonar = angle_from_sonar
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.angle = self._quantize_angles(angle)
+        self.energy = np.round(np.asarray(energy) / ENERGY_UNIT).astype(np.int16)
+        self.traveled_distance = traveled_distance
+        self.bounces = bounces
+
+
+    @staticmethod
+    def _quantize_angles(angles):
+        """ Converts angles in radians to int16 steps of 2π/65536, wrapping into
+            the signed 16-bit range (the angle is circular, so the wrap is lossless).
+
+            Args:
+                angles (:obj:`ndarray`): Angles in radians.
+
+            Returns:
+                :obj:`ndarray` of int16: Quantized angles.
+        """
+        steps = np.round(np.asarray(angles) / ANGLE_UNIT).astype(np.int64)
+        return (((steps + 32768) % 65536) - 32768).astype(np.int16)
+
+
+    def get_angles(self):
+        """ Returns the ray angles dequantized to radians, in [0, 2π].
+
+            Returns:
+                :obj:`ndarray` of float: Ray angles in radians.
+        """
+        return (self.angle.astype(np.float64) * ANGLE_UNIT) % (2 * pi)
+
+
+    def get_energies(self):
+        """ Returns the ray energies dequantized to floats.
+
+            Returns:
+                :obj:`ndarray` of float: Ray sound energies.
+        """
+        return self.energy.astype(np.float64) * ENERGY_UNIT
+
+
+    @classmethod
+    def from_rays(cls, rays):
+        """ Builds a batch from a list of Ray objects.
+
+            Args:
+                rays (:obj:`list` of :obj:`Ray`): Rays to pack into the batch.
+
+            Returns:
+                :obj:`RayBatch`: Batch holding the rays as parallel arrays.
+        """
+        return cls(np.array([ray.angle_from_sonar for ray in rays], dtype=float),
+                   np.array([ray.vector.origin_point.x for ray in rays], dtype=float),
+                   np.array([ray.vector.origin_point.y for ray in rays], dtype=float),
+                   np.array([ray.vector.angle for ray in rays], dtype=float),
+                   np.array([ray.energy for ray in rays], dtype=float),
+                   np.array([ray.traveled_distance for ray in rays], dtype=float),
+                   np.array([ray.bounces for ray in rays], dtype=int))
+
+
+    def as_list(self):
+        """ Unpacks the batch into Ray objects, for callers that still consume
+            rays one at a time (e.g. for display). Direction components are
+            computed for the whole batch before building the objects.
+
+            Returns:
+                :obj:`list` of :obj:`Ray`: Rays held in the batch.
+        """
+        angles, energies = self.get_angles(), self.get_energies()
+        cosines, sines = np.cos(angles), np.sin(angles)
+        return [Ray(self.angle_from_sonar[i],
+                    UnitVector.from_components(Point(self.origin_x[i], self.origin_y[i]), cosines[i], sines[i], angles[i]),
+                    energies[i], self.traveled_distance[i], self.bounces[i])
+                for i in range(len(self))]
+
+
+    def __len__(self):
+        return len(self.angle)
+
+
+    def __str__(self):
+        return 'RayBatch of {} rays'.format(len(self))
+
+
+    def __repr__(self):
+        return self.__str__()
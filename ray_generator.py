@@ -1,5 +1,19 @@
-from math import radians, degrees
+from math import radians, pi
+import numpy as np
+
+_RAD2DEG = 180.0 / pi # inline multiplies instead of degrees()/radians() calls in hot paths
+_DEG2RAD = pi / 180.0
+import _jit_math
+try:
+    import ray_math as _scalar_math # compiled Cython extension, built via setup.py
+except ImportError:
+    _scalar_math = _jit_math # fall back to the jitted versions
+try:
+    import _cuda_math
+except ImportError:
+    _cuda_math = None # CUDA toolchain not importable, the cpu backend still works
 from ray import Ray
+from ray_batch import RayBatch
 from unit_vector import UnitVector
 from angle_range import AngleRange
 
@@ -14,13 +28,32 @@ class RayGenerator:
                 spotlight_degrees_range (int): Degrees of deviation of the spotlight rays from their main ray. Resembling a spotlight shape.
                 energy_loss_per_degree (float): Amount of energy lost by degree deviation from a reference angle. Used to calculate bounce and secondary ray energy.
                 energy_loss_per_pixel_traveled (float): Amount of energy lost by pixel traveled. Used upon sonar hit to calculate the final energy.
+                spotlight_radians_range (float): spotlight_degrees_range converted to radians once, for the radian-based code paths.
+                energy_loss_per_radian (float): energy_loss_per_degree converted to radians once, for the radian-based code paths.
+                backend (str): 'cpu' or 'cuda'; selects where the spotlight kernel runs. Falls back to cpu when no CUDA device is available.
     """
+    backend = 'cpu'
     secondary_rays_number = 8
-    spotlight_rays = 12
+    spotlight_rays = 6
     spotlight_base_energy_factor = 0.35
     spotlight_degrees_range = 30
     energy_loss_per_degree = 0.3
     energy_loss_per_pixel_traveled = 0.05
+    spotlight_radians_range = radians(spotlight_degrees_range)
+    energy_loss_per_radian = energy_loss_per_degree * 180 / pi
+
+
+    @staticmethod
+    def _get_spotlight_backend():
+        """Returns the module providing spotlight_batch for the selected backend,
+           falling back to the jitted cpu kernel when no CUDA device is available.
+
+            Returns:
+                :obj:`module`: module exposing spotlight_batch.
+        """
+        if RayGenerator.backend == 'cuda' and _cuda_math is not None and _cuda_math.is_available():
+            return _cuda_math
+        return _jit_math
 
 
     @staticmethod
@@ -34,12 +67,11 @@ class RayGenerator:
             Returns:
                 :obj:`list` of :obj:`Ray`: primary rays
         """
-        rays = []
-        for i in range(RayGenerator.secondary_rays_number):
-            angle = range_angle.get_random_angle_in_range()
-            ray = Ray(degrees(angle), UnitVector(sonar_point, angle))
-            rays.append(ray)
-        return rays
+        rays_number = RayGenerator.secondary_rays_number
+        angles = range_angle.sample(rays_number)
+        cosines, sines, angles_degrees = np.cos(angles), np.sin(angles), angles * _RAD2DEG
+        return [Ray(angles_degrees[i], UnitVector.from_components(sonar_point, cosines[i], sines[i], angles[i]))
+                for i in range(rays_number)]
 
 
     @staticmethod
@@ -52,29 +84,40 @@ class RayGenerator:
             Returns:
                 :obj:`list` of `Ray`: spotlight rays for the primary ray
         """
-        min_angle = degrees(primary_ray.vector.angle) - RayGenerator.spotlight_degrees_range
-        max_angle = degrees(primary_ray.vector.angle) + RayGenerator.spotlight_degrees_range
-
-        min_angle = (360 + min_angle) if (min_angle < 0) else min_angle # adjust negative angle
-        max_angle = (max_angle - 360) if (max_angle > 360) else max_angle # adjust over 360 angle
-
-        angle_range = AngleRange(radians(min_angle), radians(max_angle))
-
         sonar_angle = primary_ray.angle_from_sonar
         base_energy = primary_ray.energy * RayGenerator.spotlight_base_energy_factor
         distance = primary_ray.traveled_distance
         bounces = primary_ray.bounces
         origin_point = primary_ray.vector.origin_point
 
-        rays = []
-        for i in range(RayGenerator.spotlight_rays):
-            ray_angle = angle_range.get_random_angle_in_range()
-            energy = RayGenerator.get_energy_with_degrees_loss(base_energy, degrees(primary_ray.vector.angle), degrees(ray_angle))
-            if energy > 0:
-                ray_vector = UnitVector(origin_point, ray_angle)
-                ray = Ray(sonar_angle, ray_vector, energy, distance, bounces)
-                rays.append(ray)
-        return rays
+        angles, cosines, sines, energies, count = RayGenerator._get_spotlight_backend().spotlight_batch(
+            primary_ray.vector.angle, base_energy, RayGenerator.spotlight_rays,
+            RayGenerator.spotlight_radians_range, RayGenerator.energy_loss_per_radian)
+        return [Ray(sonar_angle, UnitVector.from_components(origin_point, cosines[i], sines[i], angles[i]), energies[i], distance, bounces)
+                for i in range(count)]
+
+
+    @staticmethod
+    def get_spotlight_rays_batch(primary_ray):
+        """Like get_spotlight_rays, but packs the kernel output straight into a
+           RayBatch, so batched consumers skip the Ray objects and the
+           list-to-array copy entirely.
+
+            Args:
+                primary_ray (:obj:`Ray`): ray from which the spotlight rays come out
+
+            Returns:
+                :obj:`RayBatch`: spotlight rays for the primary ray
+        """
+        base_energy = primary_ray.energy * RayGenerator.spotlight_base_energy_factor
+        origin_point = primary_ray.vector.origin_point
+
+        angles, cosines, sines, energies, count = RayGenerator._get_spotlight_backend().spotlight_batch(
+            primary_ray.vector.angle, base_energy, RayGenerator.spotlight_rays,
+            RayGenerator.spotlight_radians_range, RayGenerator.energy_loss_per_radian)
+        return RayBatch(np.full(count, primary_ray.angle_from_sonar), np.full(count, origin_point.x),
+                        np.full(count, origin_point.y), angles[:count], energies[:count],
+                        np.full(count, primary_ray.traveled_distance), np.full(count, primary_ray.bounces, dtype=int))
 
 
     @staticmethod
@@ -89,20 +132,52 @@ class RayGenerator:
                 :obj:`list` of `Ray`: secondary rays
         """
         sonar_from_angle = primary_ray.angle_from_sonar
-        rays=[]
-        for i in range(RayGenerator.secondary_rays_number):
-            angle=range_angle.get_random_angle_in_range()
-            point=primary_ray.vector.origin_point
-            energy = RayGenerator.get_energy_with_degrees_loss(primary_ray.energy, degrees(primary_ray.vector.angle), degrees(angle))
+        point = primary_ray.vector.origin_point
+        primary_angle = primary_ray.vector.angle
+        angles = range_angle.sample(RayGenerator.secondary_rays_number)
 
-            if energy > 0:
-                ray=Ray(sonar_from_angle, UnitVector(point,angle),energy,primary_ray.traveled_distance)
-                rays.append(ray)
-        return rays
+        differences = np.abs(angles - primary_angle) % (2 * pi)
+        differences = np.where(differences <= pi, differences, 2 * pi - differences)
+        energies = primary_ray.energy - differences * RayGenerator.energy_loss_per_radian
+
+        alive = energies > 0 # cull dead rays before paying for their trig and Ray allocation
+        angles, energies = angles[alive], energies[alive]
+        cosines, sines = np.cos(angles), np.sin(angles)
+        return [Ray(sonar_from_angle, UnitVector.from_components(point, cosines[i], sines[i], angles[i]), energies[i], primary_ray.traveled_distance)
+                for i in range(len(angles))]
 
 
     @staticmethod
-    def get_energy_with_degrees_loss(source_energy, source_degrees, ray_degrees):
+    def get_secondary_rays_batch(primary_ray, range_angle):
+        """Like get_secondary_rays, but packs the surviving rays straight into a
+           RayBatch, so batched consumers skip the Ray objects and the
+           list-to-array copy entirely.
+
+            Args:
+                primary_ray (:obj:`Ray`): ray from which the secondary rays come out
+                range_angle (:obj:`AngleRange`): range in radians for secondary angles
+
+            Returns:
+                :obj:`RayBatch`: secondary rays
+        """
+        point = primary_ray.vector.origin_point
+        primary_angle = primary_ray.vector.angle
+        angles = range_angle.sample(RayGenerator.secondary_rays_number)
+
+        differences = np.abs(angles - primary_angle) % (2 * pi)
+        differences = np.where(differences <= pi, differences, 2 * pi - differences)
+        energies = primary_ray.energy - differences * RayGenerator.energy_loss_per_radian
+
+        alive = energies > 0 # cull dead rays before packing the batch
+        angles, energies = angles[alive], energies[alive]
+        count = len(angles)
+        return RayBatch(np.full(count, primary_ray.angle_from_sonar), np.full(count, point.x), np.full(count, point.y),
+                        angles, energies, np.full(count, primary_ray.traveled_distance), np.zeros(count, dtype=int))
+
+
+    @staticmethod
+    def get_energy_with_degrees_loss(source_energy, source_degrees, ray_degrees,
+                                     _energy_loss=energy_loss_per_degree, _compiled_energy_loss=_scalar_math.get_energy_with_degrees_loss):
         """Returns the energy with loss according to a source energy and angle in degrees.
            The further the ray angle is from the source, the less energy it will have.
 
@@ -114,12 +189,11 @@ class RayGenerator:
             Returns:
                 int: Energy of the ray being calculated with loss.
         """
-        degrees_difference = RayGenerator.get_degrees_difference(source_degrees, ray_degrees)
-        return source_energy - degrees_difference * RayGenerator.energy_loss_per_degree
+        return _compiled_energy_loss(source_energy, source_degrees, ray_degrees, _energy_loss)
 
 
     @staticmethod
-    def get_degrees_difference(angle_a, angle_b):
+    def get_degrees_difference(angle_a, angle_b, _compiled_difference=_scalar_math.get_degrees_difference):
         """Returns the difference between two angles in degrees. If one angle is in the first quadrant
            and the other is in the fourth quadrant, the angle return is the one between within those quadrants.
 
@@ -130,13 +204,39 @@ class RayGenerator:
             Returns:
                 int: Difference between the angles.
         """
-        between_first_and_fourth_quadrant = (angle_a < 90 and angle_b > 270 or angle_b < 90 and angle_a > 270)
-        if between_first_and_fourth_quadrant:
-            angle_a = (360 - angle_a) if (angle_a > 270) else angle_a # adjust the over 270 angle
-            angle_b = (360 - angle_b) if (angle_b > 270) else angle_b
-            return angle_a + angle_b
-        else:
-            return abs(angle_a - angle_b)
+        return _compiled_difference(angle_a, angle_b)
+
+
+    @staticmethod
+    def get_energy_with_radians_loss(source_energy, source_radians, ray_radians,
+                                     _energy_loss=energy_loss_per_radian, _compiled_energy_loss=_scalar_math.get_energy_with_radians_loss):
+        """Radian counterpart of get_energy_with_degrees_loss, for callers that
+           already have their angles in radians and would otherwise convert back
+           and forth through degrees.
+
+            Args:
+                source_energy (float): Energy of the source ray.
+                source_radians (float): Angle of the source ray in radians.
+                ray_radians (float): Angle of the ray being calculated in radians.
+
+            Returns:
+                float: Energy of the ray being calculated with loss.
+        """
+        return _compiled_energy_loss(source_energy, source_radians, ray_radians, _energy_loss)
+
+
+    @staticmethod
+    def get_radians_difference(angle_a, angle_b, _compiled_difference=_scalar_math.get_radians_difference):
+        """Radian counterpart of get_degrees_difference.
+
+            Args:
+                angle_a (float): First angle in radians.
+                angle_b (float): Second angle in radians.
+
+            Returns:
+                float: Difference between the angles.
+        """
+        return _compiled_difference(angle_a, angle_b)
 
 
     @staticmethod
@@ -155,15 +255,114 @@ class RayGenerator:
         traveled_distance = source_ray.traveled_distance + reflection_point.get_distance_to(source_ray.vector.origin_point)
         bounces = source_ray.bounces + 1
 
-        degrees_from_reflection_point_to_source_ray_origin = degrees(reflected_vector.origin_point.get_angle_to(source_ray.vector.origin_point))
+        degrees_from_reflection_point_to_source_ray_origin = reflected_vector.origin_point.get_angle_to(source_ray.vector.origin_point) * _RAD2DEG
 
         energy = line_segment.get_energy_with_absorption_loss(source_ray.energy)
-        energy = RayGenerator.get_energy_with_degrees_loss(energy, degrees_from_reflection_point_to_source_ray_origin, degrees(reflected_vector.angle))
+        energy = RayGenerator.get_energy_with_degrees_loss(energy, degrees_from_reflection_point_to_source_ray_origin, reflected_vector.angle * _RAD2DEG)
 
         reflected_ray = Ray(source_ray.angle_from_sonar, reflected_vector, energy, traveled_distance, bounces)
         return reflected_ray
 
 
+    @staticmethod
+    def get_reflected_and_returning_rays(source_ray, line_segment):
+        """Returns both rays produced by a hit in one call: the reflected ray and
+           the ray returning towards the source origin. The reflection point, the
+           returning angle and the angle-deviation loss are computed once and
+           shared, instead of being re-derived by two separate calls.
+
+            Args:
+                source_ray (:obj:`Ray`): Ray that hits the line segment.
+                line_segment (:obj:`LineSegment`): Line segment being hit.
+
+            Returns:
+                :obj:`tuple` of :obj:`Ray`: (reflected ray, returning ray).
+        """
+        source_origin = source_ray.vector.origin_point
+        reflection_point = line_segment.get_intersection_point(source_ray.vector)
+        reflected_vector = line_segment.get_reflected_vector(reflection_point, source_ray.vector)
+        traveled_distance = source_ray.traveled_distance + reflection_point.get_distance_to(source_origin)
+        bounces = source_ray.bounces + 1
+        sonar_angle = source_ray.angle_from_sonar
+
+        returning_angle = reflection_point.get_angle_to(source_origin)
+        deviation_loss = RayGenerator.get_radians_difference(returning_angle, reflected_vector.angle) * RayGenerator.energy_loss_per_radian
+
+        reflected_energy = line_segment.get_energy_with_absorption_loss(source_ray.energy) - deviation_loss
+        reflected_ray = Ray(sonar_angle, reflected_vector, reflected_energy, traveled_distance, bounces)
+
+        returning_vector = UnitVector(reflection_point, returning_angle)
+        returning_ray = Ray(sonar_angle, returning_vector, reflected_energy - deviation_loss, traveled_distance, bounces)
+        return reflected_ray, returning_ray
+
+
+    @staticmethod
+    def get_reflected_rays_wavefront(source_rays, line_segments):
+        """Advances a whole wavefront of rays by one bounce in a single batched step.
+           Instead of reflecting rays one at a time, the intersection, reflection and
+           energy loss math runs once over the RayBatch arrays with NumPy, and rays
+           that miss every segment or run out of energy are culled.
+
+            Args:
+                source_rays (:obj:`RayBatch`): batch of live rays to bounce.
+                line_segments (:obj:`list` of :obj:`LineSegment`): segments to bounce against.
+
+            Returns:
+                :obj:`RayBatch`: batch holding the surviving reflected rays after one bounce.
+        """
+        if len(source_rays) == 0 or len(line_segments) == 0: # nothing to bounce, or against
+            empty = np.empty(0)
+            return RayBatch(empty, empty, empty, empty, empty, empty, np.empty(0, dtype=int))
+
+        angle_from_sonar, energy = source_rays.angle_from_sonar, source_rays.get_energies()
+        origin_x, origin_y, angle = source_rays.origin_x, source_rays.origin_y, source_rays.get_angles()
+        traveled_distance, bounces = source_rays.traveled_distance, source_rays.bounces
+        direction_x, direction_y = np.cos(angle), np.sin(angle)
+
+        nearest_distance = np.full(angle.shape, np.inf)
+        nearest_segment = np.full(angle.shape, -1)
+        for segment_index, segment in enumerate(line_segments):
+            segment_x = segment.pointB.x - segment.pointA.x
+            segment_y = segment.pointB.y - segment.pointA.y
+            to_origin_x = origin_x - segment.pointA.x
+            to_origin_y = origin_y - segment.pointA.y
+
+            denominator = segment_x * -direction_y + segment_y * direction_x
+            with np.errstate(divide='ignore', invalid='ignore'):
+                hit_distance = (segment_x * to_origin_y - segment_y * to_origin_x) / denominator # distance from origin to intersection
+                segment_position = (to_origin_x * -direction_y + to_origin_y * direction_x) / denominator # indicates if the intersection is inside the segment
+
+            intersects = (np.abs(denominator) >= 0.000001) & (hit_distance > 0.0) & (segment_position >= 0.0) & (segment_position <= 1.0)
+            closer = intersects & (hit_distance < nearest_distance)
+            nearest_distance = np.where(closer, hit_distance, nearest_distance)
+            nearest_segment = np.where(closer, segment_index, nearest_segment)
+
+        hit = nearest_segment >= 0
+        hit_segment = np.where(hit, nearest_segment, 0)
+        distance_to_hit = np.where(hit, nearest_distance, 0.0)
+        reflection_x = origin_x + direction_x * distance_to_hit
+        reflection_y = origin_y + direction_y * distance_to_hit
+
+        segment_is_vertical = np.array([segment.is_vertical() for segment in line_segments])
+        segment_absorption = np.array([segment.sound_absorption for segment in line_segments])
+
+        comes_from_below = (reflection_y > origin_y) | (angle == 0) | (angle == pi)
+        vertical_reflection = np.where(comes_from_below, pi - angle, 3 * pi - angle)
+        reflected_angle = np.where(segment_is_vertical[hit_segment], vertical_reflection, 2 * pi - angle)
+
+        returning_angle = np.arctan2(origin_y - reflection_y, origin_x - reflection_x)
+        returning_angle = np.where(returning_angle < 0, returning_angle + 2 * pi, returning_angle)
+
+        degrees_difference = np.abs(returning_angle - reflected_angle) * _RAD2DEG % 360
+        degrees_difference = np.where(degrees_difference <= 180, degrees_difference, 360 - degrees_difference)
+        reflected_energy = energy - energy * segment_absorption[hit_segment]
+        reflected_energy = reflected_energy - degrees_difference * RayGenerator.energy_loss_per_degree
+
+        alive = hit & (reflected_energy > 0) # compact the wavefront, culling missed and dead rays
+        return RayBatch(angle_from_sonar[alive], reflection_x[alive], reflection_y[alive], reflected_angle[alive],
+                        reflected_energy[alive], (traveled_distance + distance_to_hit)[alive], (bounces + 1)[alive])
+
+
     @staticmethod
     def get_returning_reflected_ray(reflected_ray, source_ray):
         """Returns the ray that returns in the direction of a source ray after a ray reflection.
@@ -177,7 +376,7 @@ class RayGenerator:
                 :obj:`Ray`: Ray going from the reflection point to the source ray origin direction.
         """
         angle = (reflected_ray.vector.origin_point).get_angle_to(source_ray.vector.origin_point)
-        energy = RayGenerator.get_energy_with_degrees_loss(reflected_ray.energy, degrees(angle), degrees(reflected_ray.vector.angle))
+        energy = RayGenerator.get_energy_with_degrees_loss(reflected_ray.energy, angle * _RAD2DEG, reflected_ray.vector.angle * _RAD2DEG)
         vector = UnitVector(reflected_ray.vector.origin_point, angle)
         returning_ray = Ray(source_ray.angle_from_sonar, vector, energy, reflected_ray.traveled_distance, reflected_ray.bounces)
         return returning_ray
@@ -195,4 +394,19 @@ class RayGenerator:
             Returns:
                 int: Energy with distance traveled loss.
         """
-        return source_energy - traveled_distance * RayGenerator.energy_loss_per_pixel_traveled
+        return source_energy - RayGenerator.get_distance_loss_amount(traveled_distance)
+
+
+    @staticmethod
+    def get_distance_loss_amount(traveled_distance, _energy_loss=energy_loss_per_pixel_traveled):
+        """Returns the amount of energy lost over a traveled distance. Accepts an
+           ndarray of distances as well, so rays sharing a distance can compute
+           the loss once and batched callers subtract it in one operation.
+
+            Args:
+                traveled_distance (float): Distance traveled by the source ray.
+
+            Returns:
+                float: Energy lost over the distance.
+        """
+        return traveled_distance * _energy_loss
@@ -0,0 +1,36 @@
+# cython: language_level=3
+""" Optional compiled versions of the scalar angle and energy helpers.
+    Built with `python setup.py build_ext --inplace`; when the extension is
+    not built, ray_generator falls back to the jitted versions in _jit_math.
+    The function names and signatures mirror _jit_math so the two modules are
+    interchangeable.
+"""
+from libc.math cimport fabs, fmod, M_PI
+
+
+cpdef double get_degrees_difference(double angle_a, double angle_b) nogil:
+    """ Circular difference between two angles in degrees, always taking the
+        short way around (never more than 180°).
+    """
+    cdef double difference = fmod(fabs(angle_a - angle_b), 360.0)
+    return difference if difference <= 180.0 else 360.0 - difference
+
+
+cpdef double get_energy_with_degrees_loss(double source_energy, double source_degrees,
+                                          double ray_degrees, double energy_loss_per_degree) nogil:
+    """ Source energy decreased by the angle deviation times the loss per degree. """
+    return source_energy - get_degrees_difference(source_degrees, ray_degrees) * energy_loss_per_degree
+
+
+cpdef double get_radians_difference(double angle_a, double angle_b) nogil:
+    """ Circular difference between two angles in radians, always taking the
+        short way around (never more than π).
+    """
+    cdef double difference = fmod(fabs(angle_a - angle_b), 2 * M_PI)
+    return difference if difference <= M_PI else 2 * M_PI - difference
+
+
+cpdef double get_energy_with_radians_loss(double source_energy, double source_radians,
+                                          double ray_radians, double energy_loss_per_radian) nogil:
+    """ Source energy decreased by the angle deviation times the loss per radian. """
+    return source_energy - get_radians_difference(source_radians, ray_radians) * energy_loss_per_radian
@@ -0,0 +1,9 @@
+from setuptools import setup
+from Cython.Build import cythonize
+
+# builds the optional ray_math extension with `python setup.py build_ext --inplace`;
+# the simulation runs without it, falling back to the jitted helpers in _jit_math
+setup(
+    name='echo-location-ray-math',
+    ext_modules=cythonize('ray_math.pyx'),
+)
@@ -18,6 +18,27 @@ class UnitVector:
         self.direction_vector = Point(cos(self.angle), sin(self.angle))
 
 
+    @classmethod
+    def from_components(cls, origin, x_component, y_component, angle):
+        """ Builds a unit vector from already computed direction components,
+            skipping the cos/sin calls done in __init__.
+
+            Args:
+                origin (:obj:`Point`): Vector origin point.
+                x_component (float): Cosine of the vector angle.
+                y_component (float): Sine of the vector angle.
+                angle (float): Vector angle from the origin point, in radians.
+
+            Returns:
+                :obj:`UnitVector`: Vector with the given origin and direction.
+        """
+        vector = cls.__new__(cls)
+        vector.origin_point = origin
+        vector.angle = angle
+        vector.direction_vector = Point(x_component, y_component)
+        return vector
+
+
     def draw(self, window, length=1, color=(255, 255, 255)):
         """ Draws the vector in the pygame game window.
 